@@ -5,17 +5,18 @@ Main Streamlit application entry point
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import os
 
 # Import custom modules
 from src.data_generator import generate_mock_data
-from src.calculations import calculate_roi_metrics, calculate_engagement_rates
-from src.upload import handle_file_upload, validate_data_schema
-from src.dashboard import create_performance_dashboard, create_roi_dashboard
+from src.calculations import calculate_engagement_rates, BASELINE_REVENUE_SHARE
+from src.upload import (
+    handle_file_upload, validate_data_schema, downcast_numeric_columns, categorize_key_columns
+)
+from src.dashboard import create_performance_dashboard, create_roi_dashboard, get_roi_metrics
 from src.insights_fixed import create_insights_dashboard
+from src.state import AppData, CACHE_HASH_FUNCS
 
 # Page configuration
 st.set_page_config(
@@ -28,14 +29,60 @@ st.set_page_config(
 # Initialize session state
 if 'data_loaded' not in st.session_state:
     st.session_state.data_loaded = False
-if 'influencers_df' not in st.session_state:
-    st.session_state.influencers_df = None
-if 'posts_df' not in st.session_state:
-    st.session_state.posts_df = None
-if 'tracking_df' not in st.session_state:
-    st.session_state.tracking_df = None
-if 'payouts_df' not in st.session_state:
-    st.session_state.payouts_df = None
+if 'data' not in st.session_state:
+    st.session_state.data = None
+if 'pending_uploads' not in st.session_state:
+    st.session_state.pending_uploads = {}
+
+# Money columns are always floats, even when a file happens to hold only whole amounts. They are
+# cast after reading: a dtype= map on the pyarrow reader fails on files with blank counts
+MONEY_COLUMNS = ['revenue', 'rate', 'total_payout']
+
+@st.cache_data(show_spinner=False)
+def _read_csv_cached(path, mtime):
+    """Read a CSV file once per modification time, preferring an up-to-date Parquet copy"""
+    parquet_path = os.path.splitext(path)[0] + '.parquet'
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= mtime:
+        # Copies written by the data generator keep the raw types, so normalize them the same way
+        return _normalize_types(pd.read_parquet(parquet_path))
+    
+    df = _normalize_types(pd.read_csv(path, engine='pyarrow'))
+    try:
+        df.to_parquet(parquet_path, compression='zstd', index=False)
+    except OSError:
+        # Read-only deployments keep parsing the CSV
+        pass
+    return df
+
+def _normalize_types(df):
+    """Downcast count columns, widen money columns and parse dates once so the calculations never re-parse strings"""
+    df = downcast_numeric_columns(df)
+    for col in MONEY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('float64')
+    if 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date'])
+    return df
+
+def _read_csv(path):
+    """Read a CSV file through the cache, invalidated when the file changes"""
+    return _read_csv_cached(path, os.path.getmtime(path))
+
+@st.cache_data(show_spinner=False, hash_funcs=CACHE_HASH_FUNCS)
+def dataset_csv_bytes(data, name):
+    """Encode one of the loaded datasets as CSV bytes, keyed on the bundle hash instead of the DataFrame cells"""
+    return getattr(data, name).to_csv(index=False).encode('utf-8')
+
+@st.cache_data(show_spinner=False, hash_funcs=CACHE_HASH_FUNCS)
+def _data_summary(data):
+    """Headline totals for the loaded data, reduced once per distinct dataset"""
+    return {
+        'influencers': len(data.influencers),
+        'posts': len(data.posts),
+        'revenue': float(data.tracking['revenue'].sum()),
+        'orders': int(data.tracking['orders'].sum()),
+        'total_payout': float(data.payouts['total_payout'].sum())
+    }
 
 def load_default_data():
     """Load default mock data if available"""
@@ -49,10 +96,12 @@ def load_default_data():
         }
         
         if all(os.path.exists(file) for file in data_files.values()):
-            st.session_state.influencers_df = pd.read_csv(data_files['influencers'])
-            st.session_state.posts_df = pd.read_csv(data_files['posts'])
-            st.session_state.tracking_df = pd.read_csv(data_files['tracking'])
-            st.session_state.payouts_df = pd.read_csv(data_files['payouts'])
+            st.session_state.data = AppData.from_frames(*categorize_key_columns(
+                _read_csv(data_files['influencers']),
+                _read_csv(data_files['posts']),
+                _read_csv(data_files['tracking']),
+                _read_csv(data_files['payouts'])
+            ))
             st.session_state.data_loaded = True
             return True
     except Exception as e:
@@ -116,14 +165,15 @@ def main():
             st.subheader("📊 Current Data Summary")
             col1, col2, col3, col4 = st.columns(4)
             
+            data = st.session_state.data
             with col1:
-                st.metric("Influencers", len(st.session_state.influencers_df) if st.session_state.influencers_df is not None else 0)
+                st.metric("Influencers", len(data.influencers))
             with col2:
-                st.metric("Posts", len(st.session_state.posts_df) if st.session_state.posts_df is not None else 0)
+                st.metric("Posts", len(data.posts))
             with col3:
-                st.metric("Tracking Records", len(st.session_state.tracking_df) if st.session_state.tracking_df is not None else 0)
+                st.metric("Tracking Records", len(data.tracking))
             with col4:
-                st.metric("Payout Records", len(st.session_state.payouts_df) if st.session_state.payouts_df is not None else 0)
+                st.metric("Payout Records", len(data.payouts))
     
     # Campaign Performance Page
     elif page == "Campaign Performance":
@@ -131,12 +181,7 @@ def main():
             st.warning("Please upload data first to view campaign performance.")
             return
         
-        create_performance_dashboard(
-            st.session_state.influencers_df,
-            st.session_state.posts_df,
-            st.session_state.tracking_df,
-            st.session_state.payouts_df
-        )
+        create_performance_dashboard(st.session_state.data)
     
     # ROI Analysis Page
     elif page == "ROI Analysis":
@@ -144,12 +189,7 @@ def main():
             st.warning("Please upload data first to view ROI analysis.")
             return
         
-        create_roi_dashboard(
-            st.session_state.influencers_df,
-            st.session_state.posts_df,
-            st.session_state.tracking_df,
-            st.session_state.payouts_df
-        )
+        create_roi_dashboard(st.session_state.data)
     
     # Insights Page
     elif page == "Insights":
@@ -157,12 +197,7 @@ def main():
             st.warning("Please upload data first to view insights.")
             return
         
-        create_insights_dashboard(
-            st.session_state.influencers_df,
-            st.session_state.posts_df,
-            st.session_state.tracking_df,
-            st.session_state.payouts_df
-        )
+        create_insights_dashboard(st.session_state.data)
     
     # Export Data Page
     elif page == "Export Data":
@@ -172,13 +207,16 @@ def main():
         
         st.header("📤 Export Data & Reports")
         
+        data = st.session_state.data
+        summary = _data_summary(data)
+        
         col1, col2 = st.columns(2)
         
         with col1:
             st.subheader("Download Raw Data")
             
             # Influencers data
-            influencers_csv = st.session_state.influencers_df.to_csv(index=False)
+            influencers_csv = dataset_csv_bytes(data, 'influencers')
             st.download_button(
                 label="📱 Download Instagram Influencers",
                 data=influencers_csv,
@@ -187,7 +225,7 @@ def main():
             )
             
             # Posts data
-            posts_csv = st.session_state.posts_df.to_csv(index=False)
+            posts_csv = dataset_csv_bytes(data, 'posts')
             st.download_button(
                 label="📝 Download Instagram Posts",
                 data=posts_csv,
@@ -196,7 +234,7 @@ def main():
             )
             
             # Tracking data
-            tracking_csv = st.session_state.tracking_df.to_csv(index=False)
+            tracking_csv = dataset_csv_bytes(data, 'tracking')
             st.download_button(
                 label="📊 Download Campaign Tracking",
                 data=tracking_csv,
@@ -205,7 +243,7 @@ def main():
             )
             
             # Payouts data
-            payouts_csv = st.session_state.payouts_df.to_csv(index=False)
+            payouts_csv = dataset_csv_bytes(data, 'payouts')
             st.download_button(
                 label="💰 Download Payout Data",
                 data=payouts_csv,
@@ -218,10 +256,12 @@ def main():
             
             # ROI Analysis Report
             try:
-                roi_data = calculate_roi_metrics(
-                    st.session_state.tracking_df,
-                    st.session_state.payouts_df,
-                    st.session_state.influencers_df
+                roi_data = get_roi_metrics(data)
+                # Baseline revenue is only needed in the report, so it is derived here
+                roi_data.insert(
+                    roi_data.columns.get_loc('roas') + 1,
+                    'baseline_revenue',
+                    roi_data['revenue'] * BASELINE_REVENUE_SHARE
                 )
                 roi_csv = roi_data.to_csv(index=False)
                 st.download_button(
@@ -237,11 +277,11 @@ def main():
             summary_data = {
                 'Metric': ['Total Revenue', 'Total Orders', 'Instagram Influencers', 'Average ROAS', 'Total Marketing Cost'],
                 'Value': [
-                    f"₹{st.session_state.tracking_df['revenue'].sum():,.2f}",
-                    f"{st.session_state.tracking_df['orders'].sum():,}",
-                    f"{len(st.session_state.influencers_df):,}",
-                    f"{st.session_state.tracking_df['revenue'].sum() / st.session_state.payouts_df['total_payout'].sum():.2f}x" if st.session_state.payouts_df['total_payout'].sum() > 0 else "N/A",
-                    f"₹{st.session_state.payouts_df['total_payout'].sum():,.2f}"
+                    f"₹{summary['revenue']:,.2f}",
+                    f"{summary['orders']:,}",
+                    f"{summary['influencers']:,}",
+                    f"{summary['revenue'] / summary['total_payout']:.2f}x" if summary['total_payout'] > 0 else "N/A",
+                    f"₹{summary['total_payout']:,.2f}"
                 ]
             }
             summary_df = pd.DataFrame(summary_data)
@@ -258,13 +298,13 @@ def main():
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Instagram Influencers", len(st.session_state.influencers_df))
+            st.metric("Instagram Influencers", summary['influencers'])
         with col2:
-            st.metric("Total Posts", len(st.session_state.posts_df))
+            st.metric("Total Posts", summary['posts'])
         with col3:
-            st.metric("Total Orders", st.session_state.tracking_df['orders'].sum())
+            st.metric("Total Orders", summary['orders'])
         with col4:
-            st.metric("Total Revenue", f"₹{st.session_state.tracking_df['revenue'].sum():,.0f}")
+            st.metric("Total Revenue", f"₹{summary['revenue']:,.0f}")
 
 if __name__ == "__main__":
     main()
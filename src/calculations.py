@@ -4,251 +4,329 @@ ROI and performance calculation functions for HealthKart Influencer Dashboard
 
 import pandas as pd
 import numpy as np
+from collections import namedtuple
 from datetime import datetime, timedelta
 
+# Share of attributed revenue assumed to happen without the campaign (baseline purchases)
+BASELINE_REVENUE_SHARE = 0.2
+
+# Tracking data aggregated once and shared by the ROI, platform, brand and time series calculations
+TrackingRollups = namedtuple('TrackingRollups', ['by_influencer', 'by_platform', 'by_brand', 'by_date'])
+
 def calculate_engagement_rates(posts_df):
     """Calculate engagement rates for posts"""
-    posts_df = posts_df.copy()
     
-    # Calculate engagement rate: (likes + comments) / reach
-    posts_df['engagement_rate'] = (posts_df['likes'] + posts_df['comments']) / posts_df['reach']
-    posts_df['engagement_rate'] = posts_df['engagement_rate'].fillna(0)
+    # Calculate engagement rate: (likes + comments) / reach, 0 for posts without reach.
+    # The interactions buffer is divided in place so no further temporaries are allocated.
+    reach = posts_df['reach'].to_numpy(dtype=float, na_value=0.0)
+    engagement_rate = np.add(
+        posts_df['likes'].to_numpy(dtype=float, na_value=0.0),
+        posts_df['comments'].to_numpy(dtype=float, na_value=0.0)
+    )
+    has_reach = reach > 0
+    np.divide(engagement_rate, reach, out=engagement_rate, where=has_reach)
+    engagement_rate[~has_reach] = 0.0
     
-    return posts_df
+    return posts_df.assign(engagement_rate=engagement_rate)
 
-def calculate_roi_metrics(tracking_df, payouts_df, influencers_df):
-    """Calculate ROI and ROAS metrics"""
+def as_datetime(dates):
+    """Return dates as datetime64, skipping the parse when they were already parsed at load time"""
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    return pd.to_datetime(dates)
+
+def calculate_tracking_rollups(tracking_df, influencers_df=None):
+    """Aggregate tracking data by influencer, platform, brand and date in a single scan"""
+    
+    # One pass over the raw tracking rows at the finest grain any dashboard needs
+    group_cols = ['influencer_id', 'date'] + (['brand'] if 'brand' in tracking_df.columns else [])
+    base = tracking_df.groupby(group_cols, observed=True, sort=False, as_index=False, dropna=False).agg({
+        'revenue': 'sum',
+        'orders': 'sum'
+    })
     
-    # Merge tracking data with payouts and influencers
-    roi_data = tracking_df.groupby('influencer_id').agg({
+    by_influencer = base.groupby('influencer_id', observed=True, sort=False, as_index=False).agg({
         'revenue': 'sum',
         'orders': 'sum'
-    }).reset_index()
+    })
     
-    # Merge with payouts data (keep only the columns we need)
-    payout_cols = ['influencer_id', 'total_payout']
-    if 'total_payout' in payouts_df.columns:
-        roi_data = roi_data.merge(payouts_df[payout_cols], on='influencer_id', how='left')
+    by_date = base.groupby('date', sort=False, as_index=False).agg({
+        'revenue': 'sum',
+        'orders': 'sum'
+    })
+    
+    if 'brand' in base.columns:
+        by_brand = base.groupby('brand', observed=True, sort=False).agg(
+            total_revenue=('revenue', 'sum'),
+            total_orders=('orders', 'sum')
+        )
+        # Counting distinct brand/influencer pairs avoids building a set per group like nunique does
+        brand_influencers = base[['brand', 'influencer_id']].dropna().drop_duplicates()
+        by_brand['unique_influencers'] = brand_influencers.groupby(
+            'brand', observed=True, sort=False
+        ).size().reindex(by_brand.index, fill_value=0)
+        by_brand = by_brand.reset_index()
+    else:
+        by_brand = pd.DataFrame(columns=['brand', 'total_revenue', 'total_orders', 'unique_influencers'])
+    
+    # Platform totals only need the small per-influencer table joined to the influencer list
+    if influencers_df is not None:
+        by_platform = by_influencer.merge(
+            influencers_df[['influencer_id', 'platform']],
+            on='influencer_id',
+            how='left'
+        ).groupby('platform', observed=True, sort=False, as_index=False).agg({
+            'revenue': 'sum',
+            'orders': 'sum'
+        })
     else:
-        # If total_payout doesn't exist, create it from other payout columns
-        roi_data = roi_data.merge(payouts_df, on='influencer_id', how='left')
+        by_platform = pd.DataFrame(columns=['platform', 'revenue', 'orders'])
     
-    # Merge with influencer data
-    roi_data = roi_data.merge(influencers_df, on='influencer_id', how='left')
+    return TrackingRollups(by_influencer, by_platform, by_brand, by_date)
+
+# Ratio columns added by calculate_roi_metrics
+ROI_RATIO_COLUMNS = ['roas', 'incremental_roas', 'revenue_per_order', 'cost_per_order']
+
+def calculate_roi_metrics(tracking_df, payouts_df, influencers_df, rollups=None):
+    """Calculate ROI and ROAS metrics"""
     
-    # Calculate metrics
-    roi_data['total_payout'] = roi_data['total_payout'].fillna(0)
-    roi_data['revenue'] = roi_data['revenue'].fillna(0)
-    roi_data['orders'] = roi_data['orders'].fillna(0)
+    if rollups is None:
+        rollups = calculate_tracking_rollups(tracking_df, influencers_df)
     
-    # ROAS = Revenue / Cost (total_payout is the cost)
-    roi_data['roas'] = roi_data.apply(
-        lambda row: row['revenue'] / row['total_payout'] if row['total_payout'] > 0 else 0,
-        axis=1
+    # Join tracking totals with payouts and influencers on the influencer_id index
+    payouts = payouts_df.set_index('influencer_id')
+    if 'total_payout' in payouts.columns:
+        # Keep only the columns we need
+        payouts = payouts[['total_payout']]
+    
+    roi_data = (
+        rollups.by_influencer.set_index('influencer_id')
+        .join(payouts, how='left', rsuffix='_payout')
+        .join(influencers_df.set_index('influencer_id'), how='left')
+        .reset_index()
     )
     
-    # Calculate baseline revenue (assume 20% would have purchased anyway)
-    roi_data['baseline_revenue'] = roi_data['revenue'] * 0.2
+    # Revenue and orders are rollup sums and never missing; only influencers without a payout need filling
+    roi_data['total_payout'] = roi_data['total_payout'].fillna(0)
+    
+    revenue = roi_data['revenue'].to_numpy(dtype=float)
+    cost = roi_data['total_payout'].to_numpy(dtype=float)
+    orders = roi_data['orders'].to_numpy(dtype=float)
+    has_cost = cost > 0
+    has_orders = orders > 0
     
-    # Incremental ROAS = (Revenue - Baseline) / Cost
-    roi_data['incremental_roas'] = roi_data.apply(
-        lambda row: (row['revenue'] - row['baseline_revenue']) / row['total_payout'] 
-        if row['total_payout'] > 0 else 0,
-        axis=1
-    )
+    # All four ratios are written into one (n, 4) array and attached to the frame in a single step
+    ratios = np.zeros((len(roi_data), len(ROI_RATIO_COLUMNS)))
+    
+    # ROAS = Revenue / Cost (total_payout is the cost)
+    np.divide(revenue, cost, out=ratios[:, 0], where=has_cost)
+    
+    # Incremental ROAS = (Revenue - Baseline) / Cost, with the baseline folded into one scale factor
+    np.multiply(ratios[:, 0], 1 - BASELINE_REVENUE_SHARE, out=ratios[:, 1])
     
     # Revenue per order
-    roi_data['revenue_per_order'] = roi_data.apply(
-        lambda row: row['revenue'] / row['orders'] if row['orders'] > 0 else 0,
-        axis=1
-    )
+    np.divide(revenue, orders, out=ratios[:, 2], where=has_orders)
     
     # Cost per order
-    roi_data['cost_per_order'] = roi_data.apply(
-        lambda row: row['total_payout'] / row['orders'] if row['orders'] > 0 else 0,
-        axis=1
-    )
+    np.divide(cost, orders, out=ratios[:, 3], where=has_orders)
+    
+    roi_data[ROI_RATIO_COLUMNS] = ratios
     
     return roi_data
 
-def calculate_platform_metrics(posts_df, tracking_df, influencers_df):
+# Output columns of calculate_platform_metrics
+PLATFORM_METRIC_COLUMNS = [
+    'platform', 'total_revenue', 'total_orders', 'avg_engagement_rate',
+    'total_reach', 'total_likes', 'total_comments', 'unique_influencers'
+]
+
+def _empty_platform_metrics(influencers_df):
+    """Zero-filled platform metrics, used when the inputs lack the columns needed to compute them"""
+    if 'platform' in influencers_df.columns and not influencers_df.empty:
+        platforms = influencers_df['platform'].unique()
+    else:
+        platforms = ['Instagram', 'YouTube', 'LinkedIn']
+    
+    empty = pd.DataFrame(0, index=range(len(platforms)), columns=PLATFORM_METRIC_COLUMNS[1:])
+    empty.insert(0, 'platform', platforms)
+    return empty
+
+def calculate_platform_metrics(posts_df, tracking_df, influencers_df, rollups=None):
     """Calculate metrics by platform - supports multiple platforms"""
     
-    try:
-        # Merge tracking data with influencers to get platform info
-        tracking_with_platform = tracking_df.merge(
-            influencers_df[['influencer_id', 'platform']], 
-            on='influencer_id', 
-            how='left'
-        )
-        
-        # Calculate revenue and order metrics by platform
-        platform_revenue = tracking_with_platform.groupby('platform').agg({
-            'revenue': 'sum',
-            'orders': 'sum'
-        }).reset_index()
-        
-        # Calculate engagement metrics by platform
-        if not posts_df.empty:
-            posts_with_engagement = calculate_engagement_rates(posts_df)
-            # Posts already has platform information, no need to merge
-            posts_with_platform = posts_with_engagement
-            platform_engagement = posts_with_platform.groupby('platform').agg({
-                'engagement_rate': 'mean',
-                'reach': 'sum',
-                'likes': 'sum',
-                'comments': 'sum',
-                'influencer_id': 'nunique'
-            }).reset_index()
-            platform_engagement.columns = ['platform', 'avg_engagement_rate', 'total_reach', 'total_likes', 'total_comments', 'unique_influencers']
-        else:
-            # Create empty engagement data using platforms from revenue data
-            platforms = platform_revenue['platform'].unique()
-            platform_engagement = pd.DataFrame({
-                'platform': platforms,
-                'avg_engagement_rate': [0] * len(platforms),
-                'total_reach': [0] * len(platforms),
-                'total_likes': [0] * len(platforms),
-                'total_comments': [0] * len(platforms),
-                'unique_influencers': [0] * len(platforms)
-            })
-        
-        # Merge revenue and engagement metrics
-        platform_metrics = platform_revenue.merge(platform_engagement, on='platform', how='outer')
-        platform_metrics = platform_metrics.fillna(0)
-        
-        # Ensure we have the correct column structure
-        expected_columns = ['platform', 'total_revenue', 'total_orders', 'avg_engagement_rate', 'total_reach', 'total_likes', 'total_comments', 'unique_influencers']
-        
-        # Rename columns if needed
-        if 'revenue' in platform_metrics.columns:
-            platform_metrics = platform_metrics.rename(columns={'revenue': 'total_revenue'})
-        if 'orders' in platform_metrics.columns:
-            platform_metrics = platform_metrics.rename(columns={'orders': 'total_orders'})
-        
-        # Ensure all expected columns exist
-        for col in expected_columns:
-            if col not in platform_metrics.columns:
-                platform_metrics[col] = 0
-        
-        # Reorder columns to match expected structure
-        platform_metrics = platform_metrics[expected_columns]
-        
-        return platform_metrics
-        
-    except Exception as e:
-        # Return basic platform structure if error occurs
-        platforms = influencers_df['platform'].unique() if not influencers_df.empty else ['Instagram', 'YouTube', 'LinkedIn']
-        return pd.DataFrame({
-            'platform': platforms,
-            'total_revenue': [0] * len(platforms),
-            'total_orders': [0] * len(platforms),
-            'avg_engagement_rate': [0] * len(platforms),
-            'total_reach': [0] * len(platforms),
-            'total_likes': [0] * len(platforms),
-            'total_comments': [0] * len(platforms),
-            'unique_influencers': [0] * len(platforms)
+    # Validate the inputs once up front instead of catching failures mid-calculation
+    has_tracking = {'influencer_id', 'revenue', 'orders'}.issubset(tracking_df.columns)
+    has_posts = posts_df.empty or {
+        'influencer_id', 'platform', 'reach', 'likes', 'comments'
+    }.issubset(posts_df.columns)
+    if not (has_tracking and has_posts and 'platform' in influencers_df.columns):
+        return _empty_platform_metrics(influencers_df)
+    
+    if rollups is None:
+        rollups = calculate_tracking_rollups(tracking_df, influencers_df)
+    
+    # Revenue and order metrics by platform
+    platform_revenue = rollups.by_platform.rename(columns={'revenue': 'total_revenue', 'orders': 'total_orders'})
+    
+    # Calculate engagement metrics by platform
+    if not posts_df.empty:
+        # Posts already has platform information, no need to merge
+        posts_with_engagement = calculate_engagement_rates(posts_df)
+        platform_engagement = posts_with_engagement.groupby('platform', observed=True, sort=False, as_index=False).agg({
+            'engagement_rate': 'mean',
+            'reach': 'sum',
+            'likes': 'sum',
+            'comments': 'sum',
+            'influencer_id': 'nunique'
         })
+        platform_engagement.columns = ['platform', 'avg_engagement_rate', 'total_reach', 'total_likes', 'total_comments', 'unique_influencers']
+    else:
+        # Create empty engagement data using platforms from revenue data
+        platforms = platform_revenue['platform'].unique()
+        platform_engagement = pd.DataFrame(0, index=range(len(platforms)), columns=PLATFORM_METRIC_COLUMNS[3:])
+        platform_engagement.insert(0, 'platform', platforms)
+    
+    # Merge revenue and engagement metrics
+    platform_metrics = platform_revenue.merge(platform_engagement, on='platform', how='outer')
+    # Fill only the metric columns; a categorical platform key cannot take 0
+    platform_metrics = platform_metrics.fillna(
+        {col: 0 for col in PLATFORM_METRIC_COLUMNS if col != 'platform'}
+    )
+    
+    # Reorder columns to match expected structure
+    return platform_metrics[PLATFORM_METRIC_COLUMNS]
 
-def calculate_brand_metrics(tracking_df):
+def calculate_brand_metrics(tracking_df, rollups=None):
     """Calculate performance metrics by brand"""
     
-    brand_metrics = tracking_df.groupby('brand').agg({
-        'revenue': 'sum',
-        'orders': 'sum',
-        'influencer_id': 'nunique'
-    }).round(2)
+    if rollups is None:
+        rollups = calculate_tracking_rollups(tracking_df)
     
-    brand_metrics.columns = ['total_revenue', 'total_orders', 'unique_influencers']
+    # Values keep full precision; rounding is left to the display layer
+    brand_metrics = rollups.by_brand.copy()
     
     # Calculate average order value by brand
     brand_metrics['avg_order_value'] = (
         brand_metrics['total_revenue'] / brand_metrics['total_orders']
-    ).fillna(0).round(2)
+    ).fillna(0)
     
-    return brand_metrics.reset_index()
+    return brand_metrics
 
-def calculate_time_series_metrics(tracking_df, posts_df):
+def rolling_mean(values, window):
+    """Trailing rolling mean with min_periods=1, computed from a single cumulative sum"""
+    
+    cumulative = np.concatenate([[0.0], np.cumsum(values)])
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - window, 0)
+    return (cumulative[ends] - cumulative[starts]) / (ends - starts)
+
+def calculate_time_series_metrics(tracking_df, posts_df, rollups=None):
     """Calculate time series metrics for trend analysis"""
     
-    # Convert date columns
-    tracking_df['date'] = pd.to_datetime(tracking_df['date'])
-    posts_df['date'] = pd.to_datetime(posts_df['date'])
+    if rollups is None:
+        rollups = calculate_tracking_rollups(tracking_df)
     
-    # Daily revenue trends
-    daily_revenue = tracking_df.groupby('date').agg({
-        'revenue': 'sum',
-        'orders': 'sum'
-    }).reset_index()
+    # Daily revenue trends, indexed by date
+    daily_revenue = rollups.by_date.set_index(as_datetime(rollups.by_date['date']))[['revenue', 'orders']]
     
-    # Daily posting activity
-    daily_posts = posts_df.groupby('date').agg({
+    # Daily posting activity, indexed by date
+    daily_posts = posts_df.groupby(as_datetime(posts_df['date']), sort=False).agg({
         'post_id': 'count',
         'reach': 'sum',
         'likes': 'sum',
         'comments': 'sum'
-    }).reset_index()
-    daily_posts.columns = ['date', 'posts_count', 'total_reach', 'total_likes', 'total_comments']
+    })
+    daily_posts.columns = ['posts_count', 'total_reach', 'total_likes', 'total_comments']
     
-    # Merge posting and revenue data
-    time_series = daily_posts.merge(daily_revenue, on='date', how='outer')
-    time_series = time_series.fillna(0)
+    # Align posting and revenue data on the date index; the rolling averages below need chronological order
+    time_series = pd.concat([daily_posts, daily_revenue], axis=1).fillna(0).sort_index()
+    time_series = time_series.rename_axis('date').reset_index()
     
     # Calculate 7-day rolling averages
-    time_series['revenue_7d_avg'] = time_series['revenue'].rolling(window=7, min_periods=1).mean()
-    time_series['orders_7d_avg'] = time_series['orders'].rolling(window=7, min_periods=1).mean()
-    time_series['posts_7d_avg'] = time_series['posts_count'].rolling(window=7, min_periods=1).mean()
+    time_series['revenue_7d_avg'] = rolling_mean(time_series['revenue'].to_numpy(dtype=float), 7)
+    time_series['orders_7d_avg'] = rolling_mean(time_series['orders'].to_numpy(dtype=float), 7)
+    time_series['posts_7d_avg'] = rolling_mean(time_series['posts_count'].to_numpy(dtype=float), 7)
     
-    return time_series.sort_values('date')
+    return time_series
+
+# Weights for the roas, engagement, volume and efficiency components of the performance score
+SCORE_WEIGHTS = np.array([0.3, 0.25, 0.25, 0.2])
+
+# Component and composite score columns added by calculate_influencer_performance_scores
+SCORE_COLUMNS = ['roas_score', 'engagement_score', 'volume_score', 'efficiency_score', 'performance_score']
+
+def _score_kernel(metrics):
+    """Min-max scale an (n, 4) array of roas, engagement, orders and cost per order to 0-100
+    and return the component scores with the weighted composite score"""
+    
+    # Cost per order is negated so that a lower cost yields a higher efficiency score
+    metrics = metrics * np.array([1.0, 1.0, 1.0, -1.0])
+    
+    col_min = metrics.min(axis=0, initial=np.inf)
+    col_max = metrics.max(axis=0, initial=-np.inf)
+    col_range = col_max - col_min
+    constant = ~(col_range > 0)
+    scores = (metrics - col_min) / np.where(constant, 1.0, col_range) * 100
+    # Columns without any spread get a neutral score
+    scores[:, constant] = 50.0
+    
+    return scores, (scores @ SCORE_WEIGHTS).round(1)
 
 def calculate_influencer_performance_scores(roi_data, posts_df):
     """Calculate composite performance scores for influencers"""
     
     # Merge with posts data to get engagement metrics
     posts_engagement = calculate_engagement_rates(posts_df)
-    influencer_engagement = posts_engagement.groupby('influencer_id').agg({
+    influencer_engagement = posts_engagement.groupby('influencer_id', observed=True, sort=False, as_index=False).agg({
         'engagement_rate': 'mean',
         'reach': 'sum',
         'post_id': 'count'
-    }).reset_index()
+    })
     influencer_engagement.columns = ['influencer_id', 'avg_engagement_rate', 'total_reach', 'posts_count']
     
     # Merge with ROI data
     performance_data = roi_data.merge(influencer_engagement, on='influencer_id', how='left')
     
-    # Normalize metrics for scoring (0-100 scale)
-    def normalize_score(series, reverse=False):
-        if series.max() == series.min():
-            return pd.Series([50] * len(series), index=series.index)
-        
-        normalized = (series - series.min()) / (series.max() - series.min()) * 100
-        if reverse:
-            normalized = 100 - normalized
-        return normalized
-    
-    # Calculate component scores
-    performance_data['roas_score'] = normalize_score(performance_data['roas'].fillna(0))
-    performance_data['engagement_score'] = normalize_score(performance_data['avg_engagement_rate'].fillna(0))
-    performance_data['volume_score'] = normalize_score(performance_data['orders'].fillna(0))
-    performance_data['efficiency_score'] = normalize_score(performance_data['cost_per_order'].fillna(0), reverse=True)
-    
-    # Calculate composite performance score
-    performance_data['performance_score'] = (
-        performance_data['roas_score'] * 0.3 +
-        performance_data['engagement_score'] * 0.25 +
-        performance_data['volume_score'] * 0.25 +
-        performance_data['efficiency_score'] * 0.2
-    ).round(1)
+    # Score on plain arrays; pandas is only used to gather inputs and attach results
+    metrics = performance_data[['roas', 'avg_engagement_rate', 'orders', 'cost_per_order']].to_numpy(
+        dtype=float, na_value=0.0
+    )
+    component_scores, composite_score = _score_kernel(metrics)
+    
+    performance_data[SCORE_COLUMNS] = np.column_stack([component_scores, composite_score])
     
     return performance_data
 
+def top_n_positions(values, top_n):
+    """Return positions of the top_n largest values, ordered like DataFrame.nlargest
+    
+    Uses a linear-time partition and only sorts the selected values. Ties at the
+    cut-off keep the earliest positions and missing values only fill up the list.
+    """
+    
+    missing = np.isnan(values)
+    candidates = np.flatnonzero(~missing)
+    if 0 < top_n < len(candidates):
+        candidate_values = values[candidates]
+        threshold = -np.partition(-candidate_values, top_n - 1)[top_n - 1]
+        above = candidates[candidate_values > threshold]
+        at_threshold = candidates[candidate_values == threshold][:top_n - len(above)]
+        candidates = np.concatenate([above, at_threshold])
+    
+    return np.concatenate([
+        candidates[np.lexsort((candidates, -values[candidates]))],
+        np.flatnonzero(missing)
+    ])[:max(top_n, 0)]
+
 def identify_top_performers(performance_data, metric='performance_score', top_n=10):
     """Identify top performing influencers based on specified metric"""
     
-    # Filter out rows with missing influencer data
-    valid_data = performance_data.dropna(subset=['name', 'category', 'platform'])
+    # Filter out rows with missing influencer data by position, so only the top rows are copied
+    valid_rows = np.flatnonzero(
+        performance_data[['name', 'category', 'platform']].notna().all(axis=1).to_numpy()
+    )
     
-    if valid_data.empty:
+    if len(valid_rows) == 0:
         return pd.DataFrame()
     
     # Build column list avoiding duplicates
@@ -258,15 +336,26 @@ def identify_top_performers(performance_data, metric='performance_score', top_n=
     
     # Add additional metrics if they're not already included
     for col in ['roas', 'orders', 'revenue']:
-        if col not in base_cols and col in valid_data.columns:
+        if col not in base_cols and col in performance_data.columns:
             base_cols.append(col)
     
-    return valid_data.nlargest(top_n, metric)[base_cols]
+    values = performance_data[metric].to_numpy(dtype=float)[valid_rows]
+    top_rows = valid_rows[top_n_positions(values, top_n)]
+    
+    return performance_data.iloc[top_rows][base_cols]
 
 def identify_underperformers(performance_data, threshold_percentile=25):
     """Identify underperforming influencers based on performance score"""
     
-    threshold = performance_data['performance_score'].quantile(threshold_percentile / 100)
+    # A linearly interpolated quantile admits exactly the values up to the order statistic
+    # at or below it, so one partition pass finds the same cut-off without a full sort
+    scores = performance_data['performance_score'].to_numpy(dtype=float)
+    valid_scores = scores[~np.isnan(scores)]
+    if len(valid_scores):
+        k = int(np.floor((len(valid_scores) - 1) * (threshold_percentile / 100)))
+        threshold = np.partition(valid_scores, k)[k]
+    else:
+        threshold = np.nan
     
     # Build column list avoiding duplicates
     base_cols = ['influencer_id', 'name', 'category', 'platform', 'performance_score']
@@ -274,8 +363,6 @@ def identify_underperformers(performance_data, threshold_percentile=25):
         if col not in base_cols and col in performance_data.columns:
             base_cols.append(col)
     
-    underperformers = performance_data[
-        performance_data['performance_score'] <= threshold
-    ][base_cols]
+    underperformers = performance_data.loc[scores <= threshold, base_cols]
     
     return underperformers.sort_values('performance_score')
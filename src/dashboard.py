@@ -8,36 +8,65 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from src.calculations import (
-    calculate_engagement_rates, calculate_roi_metrics, 
-    calculate_platform_metrics, calculate_brand_metrics,
-    calculate_time_series_metrics, calculate_influencer_performance_scores
+    calculate_engagement_rates, calculate_roi_metrics,
+    calculate_influencer_performance_scores
 )
+from src.state import CACHE_HASH_FUNCS
 
-def create_performance_dashboard(influencers_df, posts_df, tracking_df, payouts_df):
+@st.cache_data(show_spinner=False, hash_funcs=CACHE_HASH_FUNCS)
+def get_engaged_posts(data):
+    """Posts of known influencers with their engagement rate, computed once per dataset; filters are applied afterwards"""
+    # Posts whose influencer is missing from the influencers file never count towards the KPIs
+    known_posts = data.posts[data.posts['influencer_id'].isin(data.influencers['influencer_id'])]
+    return calculate_engagement_rates(known_posts)
+
+@st.cache_data(show_spinner=False, hash_funcs=CACHE_HASH_FUNCS)
+def get_roi_metrics(data):
+    """Per-influencer ROI metrics, computed once per dataset rather than on every widget change"""
+    return calculate_roi_metrics(data.tracking, data.payouts, data.influencers, data.rollups)
+
+@st.cache_data(show_spinner=False, hash_funcs=CACHE_HASH_FUNCS)
+def get_performance_data(data):
+    """ROI metrics with composite performance scores, computed once per dataset"""
+    return calculate_influencer_performance_scores(get_roi_metrics(data), data.posts)
+
+def filter_options(column):
+    """'All' plus the distinct values of a column, read from the categories when it is categorical"""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # Categories are shared across all four datasets, so drop the ones this column never uses
+        return ['All'] + column.cat.remove_unused_categories().cat.categories.tolist()
+    return ['All'] + list(column.unique())
+
+def performer_lines(performers):
+    """Markdown listing of influencers with their platform and ROAS, one line each"""
+    return "  \n".join(
+        f"• {name} ({platform}) - {roas:.2f}x ROAS"
+        for name, platform, roas in zip(performers['name'], performers['platform'], performers['roas'])
+    )
+
+def create_performance_dashboard(data):
     """Create the main performance dashboard"""
     
-    st.header("📊 Campaign Performance Dashboard")
+    influencers_df, _, tracking_df, payouts_df = data.frames()
+    # Engagement rate is per post, so it is computed once and filtered along with the posts
+    posts_df = get_engaged_posts(data)
     
-    # Calculate metrics
-    posts_with_engagement = calculate_engagement_rates(posts_df)
-    platform_metrics = calculate_platform_metrics(posts_df, tracking_df, influencers_df)
-    brand_metrics = calculate_brand_metrics(tracking_df)
-    time_series = calculate_time_series_metrics(tracking_df, posts_df)
+    st.header("📊 Campaign Performance Dashboard")
     
     # Sidebar filters
     st.sidebar.subheader("Filters")
     
     # Platform filter
-    platforms = ['All'] + list(influencers_df['platform'].unique())
+    platforms = filter_options(influencers_df['platform'])
     selected_platform = st.sidebar.selectbox("Platform", platforms)
     
     # Category filter
-    categories = ['All'] + list(influencers_df['category'].unique())
+    categories = filter_options(influencers_df['category'])
     selected_category = st.sidebar.selectbox("Category", categories)
     
     # Brand filter (if available in tracking data)
     if 'brand' in tracking_df.columns:
-        brands = ['All'] + list(tracking_df['brand'].unique())
+        brands = filter_options(tracking_df['brand'])
         selected_brand = st.sidebar.selectbox("Brand", brands)
     else:
         selected_brand = 'All'
@@ -51,11 +80,20 @@ def create_performance_dashboard(influencers_df, posts_df, tracking_df, payouts_
     if selected_category != 'All':
         filtered_influencers = filtered_influencers[filtered_influencers['category'] == selected_category]
     
-    filtered_influencer_ids = filtered_influencers['influencer_id'].tolist()
-    
-    # Filter other dataframes
-    filtered_posts = posts_df[posts_df['influencer_id'].isin(filtered_influencer_ids)]
-    filtered_tracking = tracking_df[tracking_df['influencer_id'].isin(filtered_influencer_ids)]
+    # Filter other dataframes; both already hold only rows of known influencers, so with no
+    # influencer filter every row is kept and the lookup is skipped.
+    # Tracking rows already carry their influencer's platform and category, so they are masked directly.
+    filtered_tracking = data.tracking_with_influencer
+    if selected_platform == 'All' and selected_category == 'All':
+        filtered_posts = posts_df
+    else:
+        filtered_influencer_ids = filtered_influencers['influencer_id'].to_numpy()
+        filtered_posts = posts_df[posts_df['influencer_id'].isin(filtered_influencer_ids)]
+        
+        if selected_platform != 'All':
+            filtered_tracking = filtered_tracking[filtered_tracking['platform'] == selected_platform]
+        if selected_category != 'All':
+            filtered_tracking = filtered_tracking[filtered_tracking['category'] == selected_category]
     
     if selected_brand != 'All' and 'brand' in tracking_df.columns:
         filtered_tracking = filtered_tracking[filtered_tracking['brand'] == selected_brand]
@@ -89,13 +127,7 @@ def create_performance_dashboard(influencers_df, posts_df, tracking_df, payouts_
     with col1:
         st.subheader("Revenue by Platform")
         if not filtered_tracking.empty:
-            # Merge with full influencer data to get platform info
-            tracking_with_platform = filtered_tracking.merge(
-                influencers_df[['influencer_id', 'platform']], 
-                on='influencer_id', 
-                how='left'
-            )
-            platform_revenue = tracking_with_platform.groupby('platform')['revenue'].sum().reset_index()
+            platform_revenue = filtered_tracking.groupby('platform', observed=True)['revenue'].sum().reset_index()
             
             fig = px.bar(
                 platform_revenue, 
@@ -112,12 +144,7 @@ def create_performance_dashboard(influencers_df, posts_df, tracking_df, payouts_
     with col2:
         st.subheader("Orders by Category")
         if not filtered_tracking.empty:
-            tracking_with_category = filtered_tracking.merge(
-                influencers_df[['influencer_id', 'category']], 
-                on='influencer_id', 
-                how='left'
-            )
-            category_orders = tracking_with_category.groupby('category')['orders'].sum().reset_index()
+            category_orders = filtered_tracking.groupby('category', observed=True)['orders'].sum().reset_index()
             
             fig = px.pie(
                 category_orders, 
@@ -135,9 +162,8 @@ def create_performance_dashboard(influencers_df, posts_df, tracking_df, payouts_
     with col1:
         st.subheader("Engagement Rate by Platform")
         if not filtered_posts.empty:
-            posts_with_engagement_filtered = calculate_engagement_rates(filtered_posts)
             # Use platform directly from posts data since it already has platform column
-            platform_engagement = posts_with_engagement_filtered.groupby('platform')['engagement_rate'].mean().reset_index()
+            platform_engagement = filtered_posts.groupby('platform', observed=True)['engagement_rate'].mean().reset_index()
             
             fig = px.bar(
                 platform_engagement, 
@@ -172,7 +198,7 @@ def create_performance_dashboard(influencers_df, posts_df, tracking_df, payouts_
     # Top Performers Table
     st.subheader("Top Performing Influencers")
     if not filtered_tracking.empty:
-        influencer_performance = filtered_tracking.groupby('influencer_id').agg({
+        influencer_performance = filtered_tracking.groupby('influencer_id', observed=True).agg({
             'revenue': 'sum',
             'orders': 'sum'
         }).reset_index()
@@ -186,7 +212,7 @@ def create_performance_dashboard(influencers_df, posts_df, tracking_df, payouts_
         # Calculate revenue per follower
         influencer_performance['revenue_per_follower'] = (
             influencer_performance['revenue'] / influencer_performance['follower_count']
-        ).round(4)
+        )
         
         top_performers = influencer_performance.nlargest(10, 'revenue')[
             ['name', 'category', 'platform', 'revenue', 'orders', 'revenue_per_follower']
@@ -209,28 +235,31 @@ def create_performance_dashboard(influencers_df, posts_df, tracking_df, payouts_
     else:
         st.info("No performance data available for selected filters")
 
-def create_roi_dashboard(influencers_df, posts_df, tracking_df, payouts_df):
+def create_roi_dashboard(data):
     """Create ROI analysis dashboard"""
     
+    influencers_df, posts_df, tracking_df, payouts_df = data.frames()
+    
     st.header("💰 ROI & ROAS Analysis")
     
-    # Calculate ROI metrics
-    roi_data = calculate_roi_metrics(tracking_df, payouts_df, influencers_df)
-    performance_data = calculate_influencer_performance_scores(roi_data, posts_df)
+    # Calculate ROI metrics; the sidebar filters below only mask the cached result
+    performance_data = get_performance_data(data)
     
     # Sidebar filters
     st.sidebar.subheader("ROI Filters")
     
     # Minimum ROAS filter
     min_roas = st.sidebar.slider("Minimum ROAS", 0.0, 10.0, 0.0, 0.1)
-    filtered_roi = performance_data[performance_data['roas'] >= min_roas]
     
     # Platform filter for ROI
-    platforms = ['All'] + list(influencers_df['platform'].unique())
+    platforms = filter_options(influencers_df['platform'])
     selected_platform = st.sidebar.selectbox("Platform (ROI)", platforms)
     
+    # Combine both filters into one mask so the frame is sliced once
+    roi_mask = performance_data['roas'].to_numpy() >= min_roas
     if selected_platform != 'All':
-        filtered_roi = filtered_roi[filtered_roi['platform'] == selected_platform]
+        roi_mask &= (performance_data['platform'] == selected_platform).to_numpy()
+    filtered_roi = performance_data[roi_mask]
     
     # Key ROI Metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -291,13 +320,13 @@ def create_roi_dashboard(influencers_df, posts_df, tracking_df, payouts_df):
     # Platform ROI Comparison
     st.subheader("ROI by Platform")
     if not filtered_roi.empty:
-        platform_roi = filtered_roi.groupby('platform').agg({
+        platform_roi = filtered_roi.groupby('platform', observed=True).agg({
             'roas': 'mean',
             'incremental_roas': 'mean',
             'total_payout': 'sum',
             'revenue': 'sum',
             'orders': 'sum'
-        }).round(2).reset_index()
+        }).reset_index()
         
         fig = go.Figure()
         
@@ -321,6 +350,7 @@ def create_roi_dashboard(influencers_df, posts_df, tracking_df, payouts_df):
             title='Average ROAS by Platform',
             xaxis_title='Platform',
             yaxis_title='ROAS',
+            yaxis_hoverformat='.2f',
             barmode='group'
         )
         
@@ -370,8 +400,7 @@ def create_roi_dashboard(influencers_df, posts_df, tracking_df, payouts_df):
             st.write("**High Performers (ROAS > 3.0):**")
             high_performers = filtered_roi[filtered_roi['roas'] > 3.0]
             if not high_performers.empty:
-                for _, performer in high_performers.head(5).iterrows():
-                    st.write(f"• {performer['name']} ({performer['platform']}) - {performer['roas']:.2f}x ROAS")
+                st.markdown(performer_lines(high_performers.head(5)))
             else:
                 st.write("No influencers with ROAS > 3.0")
         
@@ -379,7 +408,6 @@ def create_roi_dashboard(influencers_df, posts_df, tracking_df, payouts_df):
             st.write("**Improvement Opportunities (ROAS < 1.0):**")
             low_performers = filtered_roi[filtered_roi['roas'] < 1.0]
             if not low_performers.empty:
-                for _, performer in low_performers.head(5).iterrows():
-                    st.write(f"• {performer['name']} ({performer['platform']}) - {performer['roas']:.2f}x ROAS")
+                st.markdown(performer_lines(low_performers.head(5)))
             else:
                 st.write("All influencers have positive ROI!")
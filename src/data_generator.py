@@ -5,9 +5,52 @@ Generates realistic sample datasets for testing and demonstration
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import random
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 import os
+from src.upload import categorize_key_columns
+
+# Sample captions for different categories
+CAPTION_TEMPLATES = {
+    'Fitness': [
+        "Just crushed my workout with @MuscleBlaze protein! 💪 #fitness #protein",
+        "Pre-workout fuel with @HKVitals supplements 🔥 #workout #energy",
+        "Recovery day essentials from @Gritzo 💯 #recovery #nutrition"
+    ],
+    'Nutrition': [
+        "Starting my day with @HKVitals multivitamins ☀️ #health #nutrition",
+        "Post-workout nutrition with @MuscleBlaze 🥤 #protein #recovery",
+        "Kids nutrition made easy with @Gritzo 👶 #kidshealth #nutrition"
+    ],
+    'Health': [
+        "Daily wellness routine with @HKVitals 🌱 #wellness #health",
+        "Supporting immunity with quality supplements 🛡️ #immunity #health",
+        "Healthy lifestyle choices matter 💚 #health #lifestyle"
+    ],
+    'Lifestyle': [
+        "Living my best life with proper nutrition 🌟 #lifestyle #health",
+        "Balance is key - fitness, nutrition, wellness 🧘‍♀️ #balance #wellness",
+        "Investing in my health daily 💪 #selfcare #health"
+    ],
+    'Sports': [
+        "Game day preparation with @MuscleBlaze 🏆 #sports #performance",
+        "Athletic performance through proper nutrition 🥇 #athletes #nutrition",
+        "Training hard, recovering smart 💪 #training #recovery"
+    ],
+    'Wellness': [
+        "Holistic wellness approach with @HKVitals 🌿 #wellness #holistic",
+        "Mind, body, soul - complete wellness 🧘 #mindfulness #wellness",
+        "Wellness journey continues 🌟 #wellnessjourney #health"
+    ]
+}
+
+
+# Caption pools per category with commas replaced up front to avoid CSV parsing issues
+CAPTION_ARRAYS = {
+    category: np.array([caption.replace(',', ' -') for caption in captions], dtype=object)
+    for category, captions in CAPTION_TEMPLATES.items()
+}
 
 def generate_mock_data():
     """Generate complete mock dataset for the dashboard"""
@@ -15,33 +58,52 @@ def generate_mock_data():
     # Ensure data directory exists
     os.makedirs('data', exist_ok=True)
     
-    # Set random seed for reproducible data
-    np.random.seed(42)
-    random.seed(42)
+    # Single seeded generator shared by every dataset for reproducible data
+    rng = np.random.default_rng(42)
     
     # Generate influencers data
-    influencers_df = generate_influencers_data()
+    influencers_df = generate_influencers_data(rng=rng)
     
     # Generate posts data
-    posts_df = generate_posts_data(influencers_df)
+    posts_df = generate_posts_data(influencers_df, rng=rng)
     
     # Generate tracking data
-    tracking_df = generate_tracking_data(influencers_df, posts_df)
+    tracking_df = generate_tracking_data(influencers_df, posts_df, rng=rng)
     
     # Generate payouts data
-    payouts_df = generate_payouts_data(influencers_df, tracking_df)
+    payouts_df = generate_payouts_data(influencers_df, tracking_df, rng=rng)
+    
+    # Store repeated ids and labels as categoricals; the CSV writer still emits the plain strings
+    influencers_df, posts_df, tracking_df, payouts_df = categorize_key_columns(
+        influencers_df, posts_df, tracking_df, payouts_df
+    )
     
-    # Save to CSV files
-    influencers_df.to_csv('data/influencers.csv', index=False)
-    posts_df.to_csv('data/posts.csv', index=False)
-    tracking_df.to_csv('data/tracking_data.csv', index=False)
-    payouts_df.to_csv('data/payouts.csv', index=False)
+    # Save to CSV files, each with a Parquet copy for fast loading
+    write_dataset(influencers_df, 'data/influencers.csv')
+    write_dataset(posts_df, 'data/posts.csv')
+    write_dataset(tracking_df, 'data/tracking_data.csv')
+    write_dataset(payouts_df, 'data/payouts.csv')
     
     return influencers_df, posts_df, tracking_df, payouts_df
 
-def generate_influencers_data(num_influencers=50):
+def write_dataset(df, path):
+    """Write a DataFrame to CSV with pyarrow's columnar writer, plus a Parquet copy next to it
+    
+    The CSV stays the human-readable source of truth; the loader reads the Parquet copy
+    instead of parsing the CSV whenever it is at least as new.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # A single 1 MiB buffer batches the file writes instead of issuing one per formatted chunk
+    with pa.output_stream(path, buffer_size=1 << 20) as sink:
+        pa_csv.write_csv(table, sink)
+    pq.write_table(table, os.path.splitext(path)[0] + '.parquet', compression='zstd')
+
+def generate_influencers_data(num_influencers=50, rng=None):
     """Generate mock influencers dataset with consistent platform assignment"""
     
+    if rng is None:
+        rng = np.random.default_rng()
+    
     categories = ['Fitness', 'Nutrition', 'Lifestyle', 'Health', 'Sports', 'Wellness']
     platforms = ['Instagram', 'YouTube', 'LinkedIn']  # Multi-platform support
     genders = ['Male', 'Female', 'Non-binary']
@@ -60,118 +122,96 @@ def generate_influencers_data(num_influencers=50):
         'Bansal', 'Sinha', 'Joshi', 'Kapoor', 'Saxena', 'Mishra', 'Pandey', 'Rao'
     ]
     
-    data = []
-    for i in range(num_influencers):
-        # Select platform first to determine appropriate follower count
-        platform = random.choice(platforms)
-        
-        # Platform-specific follower ranges (realistic for Indian market)
-        if platform == 'Instagram':
-            follower_count = random.randint(5000, 2000000)
-        elif platform == 'YouTube':
-            follower_count = random.randint(10000, 1000000)  # Subscribers
-        elif platform == 'LinkedIn':
-            follower_count = random.randint(2000, 500000)   # Connections/Followers
-        else:  # Default for any other platform
-            follower_count = random.randint(5000, 1000000)
-        
-        data.append({
-            'influencer_id': f'INF_{i+1:03d}',
-            'name': f"{random.choice(first_names)} {random.choice(last_names)}",
-            'category': random.choice(categories),
-            'gender': random.choice(genders),
-            'follower_count': follower_count,
-            'platform': platform
-        })
-    
-    return pd.DataFrame(data)
+    # Platform-specific follower ranges (realistic for Indian market), aligned with platforms
+    follower_lows = np.array([5000, 10000, 2000])
+    follower_highs = np.array([2000000, 1000000, 500000])  # Followers, subscribers, connections
+    
+    # Select platform first to determine appropriate follower count
+    platform_idx = rng.integers(len(platforms), size=num_influencers)
+    follower_count = rng.integers(
+        follower_lows[platform_idx], follower_highs[platform_idx], endpoint=True
+    )
+    
+    ids = np.arange(1, num_influencers + 1).astype(str)
+    names = np.char.add(
+        np.char.add(np.array(first_names)[rng.integers(len(first_names), size=num_influencers)], ' '),
+        np.array(last_names)[rng.integers(len(last_names), size=num_influencers)]
+    )
+    
+    return pd.DataFrame({
+        'influencer_id': np.char.add('INF_', np.char.zfill(ids, 3)),
+        'name': names,
+        'category': np.array(categories)[rng.integers(len(categories), size=num_influencers)],
+        'gender': np.array(genders)[rng.integers(len(genders), size=num_influencers)],
+        'follower_count': follower_count,
+        'platform': np.array(platforms)[platform_idx]
+    })
 
-def generate_posts_data(influencers_df, posts_per_influencer_range=(5, 15)):
+def generate_posts_data(influencers_df, posts_per_influencer_range=(5, 15), rng=None):
     """Generate mock posts dataset"""
     
-    data = []
-    post_id = 1
-    
-    # Sample captions for different categories
-    caption_templates = {
-        'Fitness': [
-            "Just crushed my workout with @MuscleBlaze protein! 💪 #fitness #protein",
-            "Pre-workout fuel with @HKVitals supplements 🔥 #workout #energy",
-            "Recovery day essentials from @Gritzo 💯 #recovery #nutrition"
-        ],
-        'Nutrition': [
-            "Starting my day with @HKVitals multivitamins ☀️ #health #nutrition",
-            "Post-workout nutrition with @MuscleBlaze 🥤 #protein #recovery",
-            "Kids nutrition made easy with @Gritzo 👶 #kidshealth #nutrition"
-        ],
-        'Health': [
-            "Daily wellness routine with @HKVitals 🌱 #wellness #health",
-            "Supporting immunity with quality supplements 🛡️ #immunity #health",
-            "Healthy lifestyle choices matter 💚 #health #lifestyle"
-        ],
-        'Lifestyle': [
-            "Living my best life with proper nutrition 🌟 #lifestyle #health",
-            "Balance is key - fitness, nutrition, wellness 🧘‍♀️ #balance #wellness",
-            "Investing in my health daily 💪 #selfcare #health"
-        ],
-        'Sports': [
-            "Game day preparation with @MuscleBlaze 🏆 #sports #performance",
-            "Athletic performance through proper nutrition 🥇 #athletes #nutrition",
-            "Training hard, recovering smart 💪 #training #recovery"
-        ],
-        'Wellness': [
-            "Holistic wellness approach with @HKVitals 🌿 #wellness #holistic",
-            "Mind, body, soul - complete wellness 🧘 #mindfulness #wellness",
-            "Wellness journey continues 🌟 #wellnessjourney #health"
+    if rng is None:
+        rng = np.random.default_rng()
+    
+    # Every post row points back at its influencer's row
+    num_posts = rng.integers(*posts_per_influencer_range, size=len(influencers_df), endpoint=True)
+    influencer_idx = np.repeat(np.arange(len(influencers_df)), num_posts)
+    total_posts = len(influencer_idx)
+    
+    influencer_ids = influencers_df['influencer_id'].to_numpy()[influencer_idx]
+    platforms = influencers_df['platform'].to_numpy()[influencer_idx]
+    categories = influencers_df['category'].to_numpy()[influencer_idx]
+    follower_count = influencers_df['follower_count'].to_numpy()[influencer_idx]
+    
+    # Generate post date within last 90 days
+    post_dates = (
+        pd.Timestamp.now().normalize()
+        - pd.to_timedelta(rng.integers(1, 90, size=total_posts, endpoint=True), unit='D')
+    ).strftime('%Y-%m-%d')
+    
+    # Reach is typically 10-30% of followers
+    reach = (follower_count * rng.uniform(0.1, 0.3, size=total_posts)).astype(np.int64)
+    
+    # Engagement rate varies by influencer tier: micro (<100k), mid-tier (<500k), macro/mega
+    tier = np.digitize(follower_count, [100000, 500000])
+    engagement_rate = rng.uniform(
+        np.array([0.03, 0.02, 0.01])[tier],
+        np.array([0.08, 0.05, 0.03])[tier]
+    )
+    
+    likes = (reach * engagement_rate * rng.uniform(0.8, 1.2, size=total_posts)).astype(np.int64)
+    comments = (likes * rng.uniform(0.02, 0.05, size=total_posts)).astype(np.int64)
+    
+    # Get appropriate caption for each post's category, filled one category at a time
+    caption_draws = rng.random(total_posts)
+    captions = np.empty(total_posts, dtype=object)
+    for category in np.unique(categories.astype(str)):
+        in_category = categories == category
+        category_captions = CAPTION_ARRAYS.get(category, CAPTION_ARRAYS['Health'])
+        captions[in_category] = category_captions[
+            (caption_draws[in_category] * len(category_captions)).astype(np.int64)
         ]
-    }
     
-    for _, influencer in influencers_df.iterrows():
-        num_posts = random.randint(*posts_per_influencer_range)
-        
-        for _ in range(num_posts):
-            # Generate post date within last 90 days
-            post_date = datetime.now() - timedelta(days=random.randint(1, 90))
-            
-            # Generate engagement metrics based on follower count
-            follower_count = influencer['follower_count']
-            
-            # Reach is typically 10-30% of followers
-            reach = int(follower_count * random.uniform(0.1, 0.3))
-            
-            # Engagement rate varies by platform and influencer tier
-            if follower_count < 100000:  # Micro influencers have higher engagement
-                engagement_rate = random.uniform(0.03, 0.08)
-            elif follower_count < 500000:  # Mid-tier
-                engagement_rate = random.uniform(0.02, 0.05)
-            else:  # Macro/mega influencers
-                engagement_rate = random.uniform(0.01, 0.03)
-            
-            likes = int(reach * engagement_rate * random.uniform(0.8, 1.2))
-            comments = int(likes * random.uniform(0.02, 0.05))
-            
-            # Get appropriate caption and ensure no commas to avoid CSV parsing issues
-            category_captions = caption_templates.get(influencer['category'], caption_templates['Health'])
-            caption = random.choice(category_captions).replace(',', ' -')
-            
-            data.append({
-                'post_id': f'POST_{post_id:04d}',
-                'influencer_id': influencer['influencer_id'],
-                'platform': influencer['platform'],
-                'date': post_date.strftime('%Y-%m-%d'),
-                'url': f"https://{influencer['platform'].lower()}.com/post/{post_id}",
-                'caption': caption,
-                'reach': reach,
-                'likes': likes,
-                'comments': comments
-            })
-            post_id += 1
-    
-    return pd.DataFrame(data)
+    post_numbers = np.arange(1, total_posts + 1).astype(str)
+    
+    return pd.DataFrame({
+        'post_id': np.char.add('POST_', np.char.zfill(post_numbers, 4)),
+        'influencer_id': influencer_ids,
+        'platform': platforms,
+        'date': np.asarray(post_dates),
+        'url': np.char.add(np.char.add('https://', np.char.lower(platforms.astype(str))), np.char.add('.com/post/', post_numbers)),
+        'caption': captions,
+        'reach': reach,
+        'likes': likes,
+        'comments': comments
+    })
 
-def generate_tracking_data(influencers_df, posts_df):
+def generate_tracking_data(influencers_df, posts_df, rng=None):
     """Generate mock tracking/attribution data"""
     
+    if rng is None:
+        rng = np.random.default_rng()
+    
     brands = ['MuscleBlaze', 'HKVitals', 'Gritzo']
     products = {
         'MuscleBlaze': ['Whey Protein', 'BCAA', 'Pre-Workout', 'Mass Gainer', 'Creatine'],
@@ -179,106 +219,106 @@ def generate_tracking_data(influencers_df, posts_df):
         'Gritzo': ['Kids Protein', 'Teen Nutrition', 'Growth Formula', 'DHA Supplement']
     }
     
-    data = []
-    tracking_id = 1
-    
-    # Generate tracking data for each post
-    for _, post in posts_df.iterrows():
-        # Not all posts generate orders (60% conversion rate)
-        if random.random() < 0.6:
-            continue
-        
-        influencer_id = post['influencer_id']
-        post_date = datetime.strptime(post['date'], '%Y-%m-%d')
-        
-        # Generate orders for 1-14 days after post
-        for day_offset in range(1, random.randint(2, 15)):
-            order_date = post_date + timedelta(days=day_offset)
-            
-            # Probability decreases over time
-            if random.random() < (0.5 ** (day_offset / 3)):
-                brand = random.choice(brands)
-                product = random.choice(products[brand])
-                
-                # Generate realistic order value based on product type
-                if 'Protein' in product:
-                    base_price = random.uniform(1500, 3000)
-                elif 'Vitamin' in product or 'Supplement' in product:
-                    base_price = random.uniform(500, 1500)
-                else:
-                    base_price = random.uniform(800, 2000)
-                
-                revenue = base_price * random.uniform(0.9, 1.1)  # Add some variance
-                
-                data.append({
-                    'tracking_id': f'TRK_{tracking_id:05d}',
-                    'source': f"{post['platform']}_influencer",
-                    'campaign': f"{brand}_{influencer_id}_{post['date']}",
-                    'influencer_id': influencer_id,
-                    'user_id': f'USER_{random.randint(10000, 99999)}',
-                    'brand': brand,
-                    'product': product,
-                    'date': order_date.strftime('%Y-%m-%d'),
-                    'orders': 1,
-                    'revenue': round(revenue, 2)
-                })
-                tracking_id += 1
-    
-    return pd.DataFrame(data)
+    # Flatten the product lists so a product is drawn as an offset into its brand's block
+    product_names = np.array([product for brand in brands for product in products[brand]])
+    product_counts = np.array([len(products[brand]) for brand in brands])
+    product_offsets = np.concatenate([[0], np.cumsum(product_counts)[:-1]])
+    
+    # Realistic order value range for each product type
+    price_ranges = []
+    for product in product_names:
+        if 'Protein' in product:
+            price_ranges.append((1500, 3000))
+        elif 'Vitamin' in product or 'Supplement' in product:
+            price_ranges.append((500, 1500))
+        else:
+            price_ranges.append((800, 2000))
+    price_lows, price_highs = np.array(price_ranges, dtype=float).T
+    
+    num_posts = len(posts_df)
+    max_days = 14
+    day_offsets = np.arange(1, max_days + 1)
+    
+    # Not all posts generate orders (60% conversion rate); converting posts
+    # generate orders for 1-14 days after the post, less likely as time passes
+    converts = rng.random(num_posts) >= 0.6
+    last_day = rng.integers(1, max_days, size=num_posts, endpoint=True)
+    has_order = (
+        converts[:, None]
+        & (day_offsets[None, :] <= last_day[:, None])
+        & (rng.random((num_posts, max_days)) < 0.5 ** (day_offsets / 3))
+    )
+    
+    # One tracking row per (post, day) with an order, in post then day order
+    post_idx, day_idx = np.nonzero(has_order)
+    num_orders = len(post_idx)
+    
+    brand_idx = rng.integers(len(brands), size=num_orders)
+    product_idx = product_offsets[brand_idx] + (rng.random(num_orders) * product_counts[brand_idx]).astype(np.int64)
+    base_price = rng.uniform(price_lows[product_idx], price_highs[product_idx])
+    revenue = base_price * rng.uniform(0.9, 1.1, size=num_orders)  # Add some variance
+    
+    influencer_ids = posts_df['influencer_id'].to_numpy().astype(str)[post_idx]
+    post_dates = posts_df['date'].to_numpy().astype(str)[post_idx]
+    order_dates = (
+        pd.to_datetime(post_dates, format='%Y-%m-%d')
+        + pd.to_timedelta(day_offsets[day_idx], unit='D')
+    ).strftime('%Y-%m-%d')
+    order_brands = np.array(brands)[brand_idx]
+    tracking_numbers = np.arange(1, num_orders + 1).astype(str)
+    
+    return pd.DataFrame({
+        'tracking_id': np.char.add('TRK_', np.char.zfill(tracking_numbers, 5)),
+        'source': np.char.add(posts_df['platform'].to_numpy().astype(str)[post_idx], '_influencer'),
+        'campaign': np.char.add(np.char.add(np.char.add(np.char.add(order_brands, '_'), influencer_ids), '_'), post_dates),
+        'influencer_id': influencer_ids,
+        'user_id': np.char.add('USER_', rng.integers(10000, 99999, size=num_orders, endpoint=True).astype(str)),
+        'brand': order_brands,
+        'product': product_names[product_idx],
+        'date': np.asarray(order_dates),
+        'orders': np.ones(num_orders, dtype=np.int64),
+        'revenue': revenue.round(2)
+    })
 
-def generate_payouts_data(influencers_df, tracking_df):
+def generate_payouts_data(influencers_df, tracking_df, rng=None):
     """Generate mock payouts data"""
     
-    data = []
-    
-    # Group tracking data by influencer
-    influencer_revenue = tracking_df.groupby('influencer_id').agg({
-        'orders': 'sum',
-        'revenue': 'sum'
-    }).reset_index()
-    
-    for _, influencer in influencers_df.iterrows():
-        influencer_id = influencer['influencer_id']
-        follower_count = influencer['follower_count']
-        
-        # Determine payout basis and rates based on influencer tier
-        if follower_count < 100000:
-            # Micro influencers often get paid per post
-            basis = 'post'
-            rate = random.uniform(5000, 15000)  # INR per post
-        else:
-            # Larger influencers often get revenue sharing
-            basis = random.choice(['post', 'order'])
-            if basis == 'post':
-                rate = random.uniform(15000, 50000)  # INR per post
-            else:
-                rate = random.uniform(0.05, 0.15)  # Percentage of revenue
-        
-        # Calculate orders and payout
-        influencer_orders = influencer_revenue[
-            influencer_revenue['influencer_id'] == influencer_id
-        ]
-        
-        if len(influencer_orders) > 0:
-            orders = influencer_orders.iloc[0]['orders']
-            revenue = influencer_orders.iloc[0]['revenue']
-            
-            if basis == 'post':
-                # For post-based payment, assume average of 3 posts per influencer
-                posts_count = 3  # Fixed number since we don't have access to posts_df here
-                total_payout = rate * posts_count
-            else:
-                total_payout = revenue * rate
-        else:
-            orders = 0
-            total_payout = 0
-        
-        data.append({
-            'influencer_id': influencer_id,
-            'basis': basis,
-            'rate': round(rate, 4),
-            'orders': int(orders),
-            'total_payout': round(total_payout, 2)
-        })
-    
-    return pd.DataFrame(data)
+    if rng is None:
+        rng = np.random.default_rng()
+    
+    # Group tracking data by influencer, aligned to the influencer rows (missing where nothing was tracked)
+    influencer_revenue = tracking_df.groupby('influencer_id', sort=False)[['orders', 'revenue']].sum()
+    influencer_revenue = influencer_revenue.reindex(influencers_df['influencer_id'])
+    has_orders = influencer_revenue['orders'].notna().to_numpy()
+    orders = influencer_revenue['orders'].fillna(0).to_numpy(dtype=np.int64)
+    revenue = influencer_revenue['revenue'].fillna(0).to_numpy()
+    
+    num_influencers = len(influencers_df)
+    follower_count = influencers_df['follower_count'].to_numpy()
+    
+    # Determine payout basis and rates based on influencer tier: micro influencers
+    # often get paid per post, larger influencers either per post or by revenue sharing
+    is_micro = follower_count < 100000
+    basis = np.where(is_micro | (rng.random(num_influencers) < 0.5), 'post', 'order')
+    rate = np.where(
+        is_micro,
+        rng.uniform(5000, 15000, size=num_influencers),  # INR per post
+        np.where(
+            basis == 'post',
+            rng.uniform(15000, 50000, size=num_influencers),  # INR per post
+            rng.uniform(0.05, 0.15, size=num_influencers)  # Percentage of revenue
+        )
+    )
+    
+    # For post-based payment, assume average of 3 posts per influencer
+    posts_count = 3  # Fixed number since we don't have access to posts_df here
+    total_payout = np.where(basis == 'post', rate * posts_count, revenue * rate)
+    total_payout = np.where(has_orders, total_payout, 0.0)
+    
+    return pd.DataFrame({
+        'influencer_id': influencers_df['influencer_id'].to_numpy(),
+        'basis': basis,
+        'rate': rate.round(4),
+        'orders': orders,
+        'total_payout': total_payout.round(2)
+    })
@@ -1,21 +1,38 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
-import plotly.graph_objects as go
 from src.calculations import (
-    calculate_roi_metrics, calculate_influencer_performance_scores,
     identify_top_performers, identify_underperformers,
-    calculate_platform_metrics, calculate_brand_metrics
+    calculate_platform_metrics, top_n_positions
 )
+from src.dashboard import get_performance_data
+from src.state import CACHE_HASH_FUNCS
 
-def generate_insights(influencers_df, posts_df, tracking_df, payouts_df):
+def summarize_performance(performance_data):
+    """Average performance score and percentage of profitable influencers, reduced on plain arrays"""
+    
+    avg_score = 0
+    profitable_pct = 0
+    if not performance_data.empty and 'performance_score' in performance_data.columns:
+        avg_score = np.nanmean(performance_data['performance_score'].to_numpy(dtype=float))
+    if not performance_data.empty and 'roas' in performance_data.columns:
+        roas = performance_data['roas'].to_numpy(dtype=float)
+        profitable_pct = np.count_nonzero(roas > 1) / len(roas) * 100
+    
+    return avg_score, profitable_pct
+
+@st.cache_data(show_spinner=False, hash_funcs=CACHE_HASH_FUNCS)
+def generate_insights(data):
     """Generate comprehensive insights from the data with robust error handling"""
     
+    influencers_df, posts_df, tracking_df, payouts_df = data.frames()
+    rollups = data.rollups
+    
     # Calculate all metrics with error handling
     try:
-        roi_data = calculate_roi_metrics(tracking_df, payouts_df, influencers_df)
-        performance_data = calculate_influencer_performance_scores(roi_data, posts_df)
-        platform_metrics = calculate_platform_metrics(posts_df, tracking_df, influencers_df)
+        performance_data = get_performance_data(data)
+        platform_metrics = calculate_platform_metrics(posts_df, tracking_df, influencers_df, rollups)
     except Exception as e:
         st.error(f"Error calculating metrics: {str(e)}")
         return None
@@ -28,18 +45,27 @@ def generate_insights(influencers_df, posts_df, tracking_df, payouts_df):
         'recommendations': []
     }
     
-    # Summary insights
-    total_revenue = tracking_df['revenue'].sum() if not tracking_df.empty else 0
-    total_cost = payouts_df['total_payout'].sum() if not payouts_df.empty else 0
+    # Summary insights, each column summed once and reused by the dashboard
+    total_revenue = float(tracking_df['revenue'].sum())
+    total_cost = float(payouts_df['total_payout'].sum())
+    total_orders = int(tracking_df['orders'].sum())
     overall_roas = total_revenue / total_cost if total_cost > 0 else 0
+    # Best platform by revenue, shared by the summary and the recommendations
+    best_platform = platform_metrics['platform'].iat[platform_metrics['total_revenue'].to_numpy().argmax()] if not platform_metrics.empty else None
+    avg_performance_score, profitable_influencers_pct = summarize_performance(performance_data)
+    # Platform distribution shown in the campaign summary
+    platform_counts = influencers_df['platform'].value_counts() if not influencers_df.empty else {}
+    platform_summary = " | ".join([f"{platform}: {count}" for platform, count in platform_counts.items()])
     
     insights['summary'] = {
         'total_revenue': total_revenue,
         'total_cost': total_cost,
+        'total_orders': total_orders,
         'overall_roas': overall_roas,
-        'avg_performance_score': performance_data['performance_score'].mean() if not performance_data.empty and 'performance_score' in performance_data.columns else 0,
-        'profitable_influencers_pct': (performance_data['roas'] > 1).mean() * 100 if not performance_data.empty and 'roas' in performance_data.columns else 0,
-        'best_platform': platform_metrics.loc[platform_metrics['total_revenue'].idxmax(), 'platform'] if not platform_metrics.empty and len(platform_metrics) > 0 else 'Instagram'
+        'avg_performance_score': avg_performance_score,
+        'profitable_influencers_pct': profitable_influencers_pct,
+        'best_platform': best_platform if best_platform is not None else 'Instagram',
+        'platform_summary': platform_summary
     }
     
     # Top performers with error handling
@@ -66,26 +92,30 @@ def generate_insights(influencers_df, posts_df, tracking_df, payouts_df):
     insights['platform_insights'] = platform_metrics
     
     # Generate recommendations
-    insights['recommendations'] = generate_recommendations(performance_data, platform_metrics, tracking_df)
+    insights['recommendations'] = generate_recommendations(performance_data, best_platform)
     
     return insights
 
-def generate_recommendations(performance_data, platform_metrics, tracking_df):
+def generate_recommendations(performance_data, best_platform=None):
     """Generate actionable recommendations based on analysis"""
     
     recommendations = []
+    if performance_data.empty:
+        return recommendations
     
     try:
+        # ROAS is read once and shared by the budget and underperformer checks
+        roas = performance_data['roas'].to_numpy(dtype=float) if 'roas' in performance_data.columns else None
+        
         # Budget allocation recommendations - multi-platform support
-        if not performance_data.empty and 'roas' in performance_data.columns:
-            # Find top performing influencers by platform
-            top_performers = performance_data.nlargest(5, 'roas')
-            if not top_performers.empty:
-                avg_top_roas = top_performers['roas'].mean()
-                # Identify best performing platform
-                if not platform_metrics.empty and 'total_revenue' in platform_metrics.columns:
-                    best_platform = platform_metrics.loc[platform_metrics['total_revenue'].idxmax(), 'platform']
-                else:
+        if roas is not None:
+            # Find top performing influencers by platform with a partition instead of a sort
+            top_roas = roas[top_n_positions(roas, 5)]
+            top_roas = top_roas[~np.isnan(top_roas)]
+            if len(top_roas) > 0:
+                avg_top_roas = top_roas.mean()
+                # Best performing platform is identified once by the caller
+                if best_platform is None:
                     best_platform = "the top performing platform"
                 
                 recommendations.append({
@@ -97,26 +127,29 @@ def generate_recommendations(performance_data, platform_metrics, tracking_df):
                 })
         
         # Underperformer optimization
-        if not performance_data.empty and 'roas' in performance_data.columns:
-            underperformers = performance_data[performance_data['roas'] < 1.0]
-            if len(underperformers) > 0:
+        if roas is not None:
+            underperformer_count = np.count_nonzero(roas < 1.0)
+            if underperformer_count > 0:
                 recommendations.append({
                     'type': 'Performance Optimization',
                     'priority': 'High',
-                    'recommendation': f"Review and optimize {len(underperformers)} underperforming influencers",
-                    'reason': f"{len(underperformers)} influencers have ROAS < 1.0",
+                    'recommendation': f"Review and optimize {underperformer_count} underperforming influencers",
+                    'reason': f"{underperformer_count} influencers have ROAS < 1.0",
                     'action': "Renegotiate rates, improve content strategy, or discontinue partnerships"
                 })
         
         # Engagement optimization
-        if not performance_data.empty and 'avg_engagement_rate' in performance_data.columns:
-            low_engagement = performance_data[performance_data['avg_engagement_rate'] < 0.03]  # Below 3%
-            if len(low_engagement) > 0:
+        if 'avg_engagement_rate' in performance_data.columns:
+            # Only the count is reported, so no filtered frame is built
+            low_engagement_count = np.count_nonzero(
+                performance_data['avg_engagement_rate'].to_numpy(dtype=float) < 0.03  # Below 3%
+            )
+            if low_engagement_count > 0:
                 recommendations.append({
                     'type': 'Content Strategy',
                     'priority': 'Medium',
-                    'recommendation': f"Improve content strategy for {len(low_engagement)} low-engagement influencers",
-                    'reason': f"{len(low_engagement)} influencers have engagement rates below 3%",
+                    'recommendation': f"Improve content strategy for {low_engagement_count} low-engagement influencers",
+                    'reason': f"{low_engagement_count} influencers have engagement rates below 3%",
                     'action': "Provide content guidelines, creative briefs, and engagement best practices"
                 })
         
@@ -131,14 +164,24 @@ def generate_recommendations(performance_data, platform_metrics, tracking_df):
     
     return recommendations
 
-def create_insights_dashboard(influencers_df, posts_df, tracking_df, payouts_df):
+def create_insights_dashboard(data):
     """Create the insights dashboard with comprehensive error handling"""
     
+    influencers_df, posts_df, tracking_df, payouts_df = data.frames()
+    
     st.title("🔍 Campaign Insights & Analytics")
     
-    # Generate insights
-    with st.spinner("Analyzing campaign performance..."):
-        insights = generate_insights(influencers_df, posts_df, tracking_df, payouts_df)
+    # Generate insights, reusing this session's copy while the dataset is unchanged so reruns
+    # from expanders and tabs skip even the cache lookup and its copy
+    insights = None
+    if st.session_state.get('insights_key') == data.content_hash:
+        insights = st.session_state.get('insights')
+    if insights is None:
+        with st.spinner("Analyzing campaign performance..."):
+            insights = generate_insights(data)
+        if insights is not None:
+            st.session_state.insights = insights
+            st.session_state.insights_key = data.content_hash
     
     if insights is None:
         st.error("Unable to generate insights. Please check your data.")
@@ -326,19 +369,19 @@ def create_insights_dashboard(influencers_df, posts_df, tracking_df, payouts_df)
     st.subheader("📈 Campaign Performance Summary")
     
     if not tracking_df.empty:
-        # Create performance summary with platform distribution
-        platform_counts = influencers_df['platform'].value_counts() if not influencers_df.empty else {}
-        platform_summary = " | ".join([f"{platform}: {count}" for platform, count in platform_counts.items()])
+        # Totals come from the insights summary instead of rescanning the columns
+        summary = insights['summary']
+        total_orders = summary['total_orders']
         
         summary_metrics = {
             'Total Influencers': len(influencers_df),
-            'Platform Distribution': platform_summary,
+            'Platform Distribution': summary['platform_summary'],
             'Total Posts': len(posts_df),
-            'Total Orders': tracking_df['orders'].sum(),
-            'Total Revenue': f"₹{tracking_df['revenue'].sum():,.0f}",
-            'Average Order Value': f"₹{tracking_df['revenue'].sum() / tracking_df['orders'].sum():.0f}" if tracking_df['orders'].sum() > 0 else "N/A",
-            'Marketing Cost': f"₹{payouts_df['total_payout'].sum():,.0f}",
-            'Overall ROAS': f"{tracking_df['revenue'].sum() / payouts_df['total_payout'].sum():.2f}x" if payouts_df['total_payout'].sum() > 0 else "N/A"
+            'Total Orders': total_orders,
+            'Total Revenue': f"₹{summary['total_revenue']:,.0f}",
+            'Average Order Value': f"₹{summary['total_revenue'] / total_orders:.0f}" if total_orders > 0 else "N/A",
+            'Marketing Cost': f"₹{summary['total_cost']:,.0f}",
+            'Overall ROAS': f"{summary['overall_roas']:.2f}x" if summary['total_cost'] > 0 else "N/A"
         }
         
         # Display as metrics
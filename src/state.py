@@ -0,0 +1,62 @@
+"""
+Session data container for HealthKart Influencer Dashboard
+"""
+
+from dataclasses import dataclass
+import hashlib
+from functools import cached_property
+import pandas as pd
+from src.calculations import TrackingRollups, calculate_tracking_rollups
+
+# Influencer attributes copied onto each tracking row so pages can filter and group without merging
+TRACKING_INFLUENCER_COLUMNS = ['platform', 'category']
+
+@dataclass(frozen=True, eq=False)
+class AppData:
+    """The four campaign datasets plus the tracking views derived from them, stored once in session state"""
+
+    influencers: pd.DataFrame
+    posts: pd.DataFrame
+    tracking: pd.DataFrame
+    payouts: pd.DataFrame
+    rollups: TrackingRollups
+    tracking_with_influencer: pd.DataFrame
+
+    @classmethod
+    def from_frames(cls, influencers_df, posts_df, tracking_df, payouts_df):
+        """Bundle loaded datasets and precompute the tracking rollups shared by every page"""
+        rollups = calculate_tracking_rollups(tracking_df, influencers_df)
+        attributes = [col for col in TRACKING_INFLUENCER_COLUMNS if col in influencers_df.columns]
+        # One row per influencer, so a repeated id in an upload cannot duplicate tracking rows
+        # and inflate the revenue and order KPIs computed from this frame. The inner join keeps
+        # only rows of known influencers, which is all the performance page ever counts
+        tracking_with_influencer = tracking_df.merge(
+            influencers_df[['influencer_id'] + attributes].drop_duplicates('influencer_id'),
+            on='influencer_id',
+            how='inner',
+            validate='many_to_one'
+        )
+        return cls(influencers_df, posts_df, tracking_df, payouts_df, rollups, tracking_with_influencer)
+
+    def frames(self):
+        """Return the datasets in the (influencers, posts, tracking, payouts) order used across the app"""
+        return self.influencers, self.posts, self.tracking, self.payouts
+
+    @cached_property
+    def content_hash(self):
+        """Hash of the dataset schemas and contents, computed once per bundle
+        
+        Column names, dtypes and shapes are part of the key, and the row hashes are digested
+        in order, so datasets that differ only in their headers or row order never collide.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for df in self.frames():
+            digest.update(repr((tuple(df.columns), tuple(map(str, df.dtypes)), df.shape)).encode('utf-8'))
+            digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        return digest.digest()
+
+    def __hash__(self):
+        return hash(self.content_hash)
+
+# Lets st.cache_data key on the bundle's content hash instead of re-hashing every DataFrame
+CACHE_HASH_FUNCS = {AppData: lambda data: data.content_hash}
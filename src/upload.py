@@ -4,7 +4,58 @@ File upload and data validation functions for HealthKart Influencer Dashboard
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import io
+from pandas.api.types import union_categoricals
+from src.state import AppData
+
+# Count columns that comfortably fit in 32-bit integers for campaign-sized data
+COUNT_COLUMNS = ['follower_count', 'reach', 'likes', 'comments', 'orders']
+
+# Low-cardinality string keys used by joins, filters and groupbys
+CATEGORICAL_COLUMNS = ['influencer_id', 'platform', 'category', 'brand']
+
+# Filename keyword for each upload type, checked in priority order
+UPLOAD_FILE_TYPES = [
+    ('influencer', 'influencers'),
+    ('post', 'posts'),
+    ('tracking', 'tracking_data'),
+    ('payout', 'payouts')
+]
+
+def categorize_key_columns(influencers_df, posts_df, tracking_df, payouts_df):
+    """Convert key columns to categoricals sharing the same categories across all four datasets"""
+    
+    frames = (influencers_df, posts_df, tracking_df, payouts_df)
+    for col in CATEGORICAL_COLUMNS:
+        with_col = [df for df in frames if col in df.columns]
+        if not with_col:
+            continue
+        
+        # All-blank columns have no categories to contribute, whatever dtype they were inferred as
+        categoricals = [df[col].astype('category') for df in with_col]
+        non_empty = [c for c in categoricals if len(c.cat.categories)] or categoricals[:1]
+        if len({c.cat.categories.dtype for c in non_empty}) > 1:
+            # Keys parsed as different types (e.g. int ids next to float ids with a blank) cannot
+            # share categories; leave them as read so merges still match by value
+            continue
+        
+        # Identical categories keep merges on the integer codes instead of falling back to objects
+        categories = union_categoricals(non_empty, ignore_order=True).categories
+        for df in with_col:
+            df[col] = pd.Categorical(df[col], categories=categories)
+    
+    return frames
+
+def downcast_numeric_columns(df):
+    """Store count columns as int32 to halve the memory scanned by every aggregation"""
+    
+    int32_max = np.iinfo(np.int32).max
+    for col in COUNT_COLUMNS:
+        if col in df.columns and pd.api.types.is_integer_dtype(df[col]) and df[col].abs().max() <= int32_max:
+            df[col] = df[col].astype('int32')
+    
+    return df
 
 def validate_data_schema(df, expected_schema):
     """Validate if DataFrame matches expected schema"""
@@ -22,6 +73,20 @@ def validate_data_schema(df, expected_schema):
     
     return issues
 
+@st.cache_data(show_spinner=False, max_entries=16)
+def _parse_uploaded_csv(data):
+    """Parse uploaded CSV bytes once per distinct file content, so reruns skip re-tokenizing"""
+    
+    # pyarrow tokenizes on multiple threads and already infers ISO dates as timestamps
+    df = downcast_numeric_columns(pd.read_csv(io.BytesIO(data), engine='pyarrow'))
+    if 'date' in df.columns:
+        try:
+            df['date'] = pd.to_datetime(df['date'])
+        except (ValueError, TypeError):
+            # Unparseable dates stay as text and are reported by validate_data_quality
+            pass
+    return df
+
 def handle_file_upload(uploaded_files):
     """Handle multiple CSV file uploads and validation"""
     
@@ -37,25 +102,17 @@ def handle_file_upload(uploaded_files):
     
     for uploaded_file in uploaded_files:
         try:
-            # Read the CSV file
-            df = pd.read_csv(uploaded_file)
-            
-            # Determine file type based on filename
-            file_type = None
+            # Determine file type based on filename before parsing, so unrecognised files are never read
             filename = uploaded_file.name.lower()
+            file_type = next((name for keyword, name in UPLOAD_FILE_TYPES if keyword in filename), None)
             
-            if 'influencer' in filename:
-                file_type = 'influencers'
-            elif 'post' in filename:
-                file_type = 'posts'
-            elif 'tracking' in filename:
-                file_type = 'tracking_data'
-            elif 'payout' in filename:
-                file_type = 'payouts'
-            else:
+            if file_type is None:
                 st.warning(f"Cannot determine file type for {uploaded_file.name}. Please ensure filename contains 'influencer', 'post', 'tracking', or 'payout'.")
                 continue
             
+            # Read the CSV file through the content-keyed cache
+            df = _parse_uploaded_csv(uploaded_file.getvalue())
+            
             # Validate schema
             if file_type in schemas:
                 issues = validate_data_schema(df, schemas[file_type])
@@ -74,23 +131,37 @@ def handle_file_upload(uploaded_files):
     
     # Update session state with uploaded data
     if uploaded_data:
-        if 'influencers' in uploaded_data:
-            st.session_state.influencers_df = uploaded_data['influencers']
-        if 'posts' in uploaded_data:
-            st.session_state.posts_df = uploaded_data['posts']
-        if 'tracking_data' in uploaded_data:
-            st.session_state.tracking_df = uploaded_data['tracking_data']
-        if 'payouts' in uploaded_data:
-            st.session_state.payouts_df = uploaded_data['payouts']
+        required_data = ['influencers', 'posts', 'tracking_data', 'payouts']
+        
+        # Start from the currently loaded datasets so a partial upload replaces only those files
+        pending = {}
+        if st.session_state.get('data') is not None:
+            pending = dict(zip(required_data, st.session_state.data.frames()))
+        pending.update(st.session_state.get('pending_uploads', {}))
+        pending.update(uploaded_data)
         
         # Check if we have all required data
-        required_data = ['influencers_df', 'posts_df', 'tracking_df', 'payouts_df']
-        if all(getattr(st.session_state, attr, None) is not None for attr in required_data):
+        if all(name in pending for name in required_data):
+            # Shared categorical keys, as for the default data, keep joins and groupbys on integer codes.
+            # Categorizing reassigns columns in place, so work on copies: frames kept from the current
+            # dataset still belong to its frozen AppData, whose hash and derived views are already built
+            try:
+                data = AppData.from_frames(*categorize_key_columns(
+                    *(pending[name].copy() for name in required_data)
+                ))
+            except Exception as e:
+                # Keep the files so re-uploading just the faulty one retries the bundle
+                st.session_state.pending_uploads = pending
+                st.error(f"Error combining uploaded data: {str(e)}")
+                return
+            
+            st.session_state.data = data
+            st.session_state.pending_uploads = {}
             st.session_state.data_loaded = True
             st.success("🎉 All data files uploaded successfully! You can now view the dashboard.")
         else:
-            missing = [attr.replace('_df', '') for attr in required_data 
-                      if getattr(st.session_state, attr, None) is None]
+            st.session_state.pending_uploads = pending
+            missing = [name.replace('_data', '') for name in required_data if name not in pending]
             st.info(f"Still need: {', '.join(missing)} data files")
 
 def show_data_preview(df, title):
@@ -106,11 +177,22 @@ def show_data_preview(df, title):
             st.write("Numeric Column Statistics:")
             st.dataframe(df[numeric_cols].describe())
 
+def has_invalid_dates(dates):
+    """Check whether any non-missing value fails to parse as a date, without raising"""
+    
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return False
+    parsed = pd.to_datetime(dates, errors='coerce')
+    return bool((parsed.isna() & dates.notna()).any())
+
 def validate_data_quality(influencers_df, posts_df, tracking_df, payouts_df):
     """Perform comprehensive data quality checks"""
     
     issues = []
     
+    # Null checks for every required tracking column in one frame-level pass
+    tracking_nulls = tracking_df[['influencer_id', 'revenue', 'orders']].isna().any()
+    
     # Check for missing required fields
     if influencers_df['influencer_id'].isnull().any():
         issues.append("Missing influencer IDs in influencers data")
@@ -118,43 +200,36 @@ def validate_data_quality(influencers_df, posts_df, tracking_df, payouts_df):
     if posts_df['influencer_id'].isnull().any():
         issues.append("Missing influencer IDs in posts data")
     
-    if tracking_df['influencer_id'].isnull().any():
+    if tracking_nulls['influencer_id']:
         issues.append("Missing influencer IDs in tracking data")
     
-    # Check for orphaned records
-    influencer_ids = set(influencers_df['influencer_id'].unique())
-    post_influencer_ids = set(posts_df['influencer_id'].unique())
-    tracking_influencer_ids = set(tracking_df['influencer_id'].unique())
-    payout_influencer_ids = set(payouts_df['influencer_id'].unique())
+    # Check for orphaned records with hashed Index differences instead of Python sets
+    influencer_ids = pd.Index(influencers_df['influencer_id'].unique())
     
-    orphaned_posts = post_influencer_ids - influencer_ids
-    if orphaned_posts:
+    orphaned_posts = pd.Index(posts_df['influencer_id'].unique()).difference(influencer_ids)
+    if len(orphaned_posts):
         issues.append(f"Posts exist for non-existent influencers: {len(orphaned_posts)} influencers")
     
-    orphaned_tracking = tracking_influencer_ids - influencer_ids
-    if orphaned_tracking:
+    orphaned_tracking = pd.Index(tracking_df['influencer_id'].unique()).difference(influencer_ids)
+    if len(orphaned_tracking):
         issues.append(f"Tracking data exists for non-existent influencers: {len(orphaned_tracking)} influencers")
     
-    orphaned_payouts = payout_influencer_ids - influencer_ids
-    if orphaned_payouts:
+    orphaned_payouts = pd.Index(payouts_df['influencer_id'].unique()).difference(influencer_ids)
+    if len(orphaned_payouts):
         issues.append(f"Payouts exist for non-existent influencers: {len(orphaned_payouts)} influencers")
     
     # Check for data consistency
-    if tracking_df['revenue'].isnull().any():
+    if tracking_nulls['revenue']:
         issues.append("Missing revenue values in tracking data")
     
-    if tracking_df['orders'].isnull().any():
+    if tracking_nulls['orders']:
         issues.append("Missing order counts in tracking data")
     
-    # Check date formats
-    try:
-        pd.to_datetime(posts_df['date'])
-    except:
+    # Check date formats in one coerced pass; values that were present but parse to NaT are invalid
+    if has_invalid_dates(posts_df['date']):
         issues.append("Invalid date format in posts data")
     
-    try:
-        pd.to_datetime(tracking_df['date'])
-    except:
+    if has_invalid_dates(tracking_df['date']):
         issues.append("Invalid date format in tracking data")
     
     return issues